@@ -1,7 +1,9 @@
-from typing import Dict
+from enum import IntEnum
+from functools import partial
+from typing import Any, Callable, Dict, Final, List, NamedTuple, Set, Tuple
 
 from binaryninjaui import UIContext
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, Slot
 from PySide6.QtWidgets import (
     QCheckBox,
     QComboBox,
@@ -22,12 +24,65 @@ from mui.dockwidgets.list_widget import ListWidget
 from mui.settings import MUISettings
 
 
+class _SettingType(IntEnum):
+    UNKNOWN = 0
+    STRING = 1
+    NUMBER = 2
+    ARRAY = 3
+    BOOLEAN = 4
+
+
+_TYPE_ENUM: Dict[str, _SettingType] = {
+    "string": _SettingType.STRING,
+    "number": _SettingType.NUMBER,
+    "array": _SettingType.ARRAY,
+    "boolean": _SettingType.BOOLEAN,
+}
+
+
+class _SettingSpec(NamedTuple):
+    name: str
+    type: _SettingType
+    has_possible_values: bool
+    is_dir_path: bool
+    prop: Dict[str, Any]
+    extra: Dict[str, Any]
+
+
+def _build_schema(prefix: str) -> Tuple[_SettingSpec, ...]:
+    """Flatten the settings of a given prefix so the dialog does not re-inspect them on every edit"""
+    return tuple(
+        _SettingSpec(
+            name,
+            _TYPE_ENUM.get(prop["type"], _SettingType.UNKNOWN),
+            "possible_values" in extra,
+            extra.get("is_dir_path", False),
+            prop,
+            extra,
+        )
+        for name, (prop, extra) in MUISettings.SETTINGS[prefix].items()
+    )
+
+
+# computed once per prefix since MUISettings.SETTINGS does not change after import
+_SCHEMAS: Dict[str, Tuple[_SettingSpec, ...]] = {
+    prefix: _build_schema(prefix) for prefix in MUISettings.PREFIXES
+}
+
+
 class RunDialog(QDialog):
+
+    # delay used to coalesce bursts of edits into a single settings write
+    APPLY_DELAY_MS: Final[int] = 150
+
     def __init__(self, parent: QWidget, data: BinaryView, prefix: str):
         self.bv = data
         self.entries: Dict[str, QWidget] = {}
         self.initialized = False
         self.prefix = prefix
+        self.schema = _SCHEMAS[prefix]
+        self._dirty: Set[str] = set()
+        self._last_written: Dict[str, Any] = {}
 
         QDialog.__init__(self, parent)
 
@@ -35,6 +90,11 @@ class RunDialog(QDialog):
         self.setMinimumSize(UIContext.getScaledWindowSize(600, 130))
         self.setAttribute(Qt.WA_DeleteOnClose)
 
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.setInterval(RunDialog.APPLY_DELAY_MS)
+        self._apply_timer.timeout.connect(self.apply)
+
         layout = QVBoxLayout()
 
         titleLabel = QLabel("Manticore Settings")
@@ -44,19 +104,16 @@ class RunDialog(QDialog):
 
         form_wrapper = QWidget()
         self.form_layout = QFormLayout(form_wrapper)
-        for name, (prop, extra) in MUISettings.SETTINGS[prefix].items():
+        for name, setting_type, has_possible_values, is_dir_path, prop, extra in self.schema:
             title = prop["title"]
             label = QLabel(title)
             label.setToolTip(prop["description"])
-            if "is_dir_path" in extra and extra["is_dir_path"]:
+            if is_dir_path:
                 entry = QLineEdit()
-                entry.editingFinished.connect(lambda: self.apply())
+                entry.editingFinished.connect(partial(self._schedule_apply, name))
                 button = QPushButton("Select...")
 
-                # the default parameter here is used for reference capture
-                button.clicked.connect(
-                    lambda _=None, entry=entry: self._select_path(title, entry, select_dir=True)
-                )
+                button.clicked.connect(partial(self._select_path, name, title, entry, True))
 
                 item = QHBoxLayout()
                 item.addWidget(entry)
@@ -65,40 +122,35 @@ class RunDialog(QDialog):
                 self.entries[name] = entry
             elif "is_file_path" in extra and extra["is_file_path"]:
                 entry = QLineEdit()
-                entry.editingFinished.connect(lambda: self.apply())
+                entry.editingFinished.connect(partial(self._schedule_apply, name))
                 button = QPushButton("Select...")
 
-                # the default parameter here is used for reference capture
-                button.clicked.connect(
-                    lambda _=None, entry=entry: self._select_path(title, entry, select_dir=False)
-                )
+                button.clicked.connect(partial(self._select_path, name, title, entry, False))
 
                 item = QHBoxLayout()
                 item.addWidget(entry)
                 item.addWidget(button)
 
                 self.entries[name] = entry
-            elif prop["type"] in ["string", "number"]:
+            elif setting_type in (_SettingType.STRING, _SettingType.NUMBER):
 
-                if "possible_values" in extra:
+                if has_possible_values:
                     item = QComboBox()
                     item.addItems([str(val) for val in extra["possible_values"]])
-                    item.currentIndexChanged.connect(lambda: self.apply())
+                    item.currentIndexChanged.connect(partial(self._schedule_apply, name))
                 else:
                     item = QLineEdit()
-                    item.editingFinished.connect(lambda: self.apply())
+                    item.editingFinished.connect(partial(self._schedule_apply, name))
 
                 self.entries[name] = item
-            elif prop["type"] == "boolean":
+            elif setting_type == _SettingType.BOOLEAN:
                 item = QCheckBox()
-                item.stateChanged.connect(lambda: self.apply())
+                item.stateChanged.connect(partial(self._schedule_apply, name))
                 self.entries[name] = item
-            elif prop["type"] == "array":
+            elif setting_type == _SettingType.ARRAY:
                 item = ListWidget(
-                    validate_fun=lambda: self.apply(),
-                    possible_values=extra["possible_values"]
-                    if "possible_values" in extra
-                    else None,
+                    validate_fun=partial(self._schedule_apply, name),
+                    possible_values=extra["possible_values"] if has_possible_values else None,
                     allow_repeats=extra["allow_repeats"] if "allow_repeats" in extra else True,
                 )
                 self.entries[name] = item
@@ -112,9 +164,9 @@ class RunDialog(QDialog):
 
         buttonLayout = QHBoxLayout()
         self.cancelButton = QPushButton("Cancel")
-        self.cancelButton.clicked.connect(lambda: self.reject())
+        self.cancelButton.clicked.connect(self.reject)
         self.acceptButton = QPushButton("Accept")
-        self.acceptButton.clicked.connect(lambda: self.accept())
+        self.acceptButton.clicked.connect(self.accept)
         self.acceptButton.setDefault(True)
         buttonLayout.addStretch(1)
         buttonLayout.addWidget(self.cancelButton)
@@ -133,94 +185,153 @@ class RunDialog(QDialog):
 
         self.setLayout(layout)
 
-        self.accepted.connect(lambda: self.apply())
-
         self._try_restore_options()
         self.initialized = True
 
-    def _select_path(self, name: str, widget: QLineEdit, select_dir: bool = True):
+    def _select_path(self, name: str, title: str, widget: QLineEdit, select_dir: bool, *_: Any):
+        """Prompt for a file or directory and store it in the given entry (signal args are ignored)"""
         if select_dir:
-            selected_url = QFileDialog.getExistingDirectory(self, f"Select {name} Directory")
+            selected_url = QFileDialog.getExistingDirectory(self, f"Select {title} Directory")
         else:
-            selected_url = QFileDialog.getOpenFileName(self, f"Select {name} File")[0]
+            selected_url = QFileDialog.getOpenFileName(self, f"Select {title} File")[0]
         if selected_url != "":
             widget.setText(selected_url)
+            # setText does not emit editingFinished
+            self._schedule_apply(name)
 
-    def _try_restore_options(self):
-        """Try restoring run options if they are set before"""
-
-        settings = Settings()
-        for name, (prop, extra) in MUISettings.SETTINGS[self.prefix].items():
-            if prop["type"] == "string":
-                value = settings.get_string(f"{self.prefix}{name}", self.bv)
-
-                if "possible_values" in extra:
-                    if value in extra["possible_values"]:
-                        self.entries[name].setCurrentIndex(extra["possible_values"].index(value))
-                else:
-                    self.entries[name].setText(value)
-            elif prop["type"] == "number":
-                # get_integer can only be used for positive integers, so using get_double as a workaround
-                value = int(settings.get_double(f"{self.prefix}{name}", self.bv))
-
-                self.entries[name].setText(str(value))
-
-            elif prop["type"] == "array":
-                self.entries[name].set_rows(
-                    settings.get_string_list(f"{self.prefix}{name}", self.bv)
-                )
-            elif prop["type"] == "boolean":
-                self.entries[name].setChecked(settings.get_bool(f"{self.prefix}{name}", self.bv))
-
-    def apply(self):
-        """Validate inputs and save them to settings"""
+    def _schedule_apply(self, name: str, *_: Any):
+        """Mark a setting as changed and (re)start the apply timer (signal args are ignored)"""
 
         # Do not want this function to be called when restoring options during init
         if not self.initialized:
             return
 
-        try:
-            settings = Settings()
-            for name, (prop, extra) in MUISettings.SETTINGS[self.prefix].items():
-                if prop["type"] == "string":
-
-                    if "possible_values" in extra:
-                        value = self.entries[name].currentText()
-                    else:
-                        value = self.entries[name].text()
+        self._dirty.add(name)
+        self._apply_timer.start()
 
-                    settings.set_string(
-                        f"{self.prefix}{name}",
-                        value,
-                        view=self.bv,
-                        scope=SettingsScope.SettingsResourceScope,
-                    )
-                elif prop["type"] == "number":
+    def _try_restore_options(self):
+        """Try restoring run options if they are set before"""
 
-                    # set_integer can only be used for positive integers, so using set_double as a workaround
-                    settings.set_double(
-                        f"{self.prefix}{name}",
-                        int(self.entries[name].text()),
-                        view=self.bv,
-                        scope=SettingsScope.SettingsResourceScope,
-                    )
+        settings = Settings()
+        for spec in self.schema:
+            restore = RunDialog._RESTORE.get(spec.type)
+            if restore is not None:
+                # remember what is already stored so that apply can skip unchanged settings
+                self._last_written[spec.name] = restore(self, settings, spec)
+
+    def _restore_string(self, settings: Settings, spec: _SettingSpec) -> str:
+        value = settings.get_string(f"{self.prefix}{spec.name}", self.bv)
+
+        if spec.has_possible_values:
+            if value in spec.extra["possible_values"]:
+                self.entries[spec.name].setCurrentIndex(spec.extra["possible_values"].index(value))
+        else:
+            self.entries[spec.name].setText(value)
+        return value
+
+    def _restore_number(self, settings: Settings, spec: _SettingSpec) -> int:
+        # get_integer can only be used for positive integers, so using get_double as a workaround
+        value = int(settings.get_double(f"{self.prefix}{spec.name}", self.bv))
+
+        self.entries[spec.name].setText(str(value))
+        return value
+
+    def _restore_array(self, settings: Settings, spec: _SettingSpec) -> List[str]:
+        value = settings.get_string_list(f"{self.prefix}{spec.name}", self.bv)
+
+        self.entries[spec.name].set_rows(value)
+        return value
+
+    def _restore_bool(self, settings: Settings, spec: _SettingSpec) -> bool:
+        value = settings.get_bool(f"{self.prefix}{spec.name}", self.bv)
+
+        self.entries[spec.name].setChecked(value)
+        return value
+
+    def _read_string(self, spec: _SettingSpec) -> str:
+        if spec.has_possible_values:
+            return self.entries[spec.name].currentText()
+        return self.entries[spec.name].text()
+
+    def _read_number(self, spec: _SettingSpec) -> int:
+        return int(self.entries[spec.name].text())
+
+    def _read_array(self, spec: _SettingSpec) -> List[str]:
+        return self.entries[spec.name].get_results()
+
+    def _read_bool(self, spec: _SettingSpec) -> bool:
+        return self.entries[spec.name].isChecked()
+
+    # handlers for each setting type, looked up once per setting instead of comparing types
+    _RESTORE: Final[Dict[_SettingType, Callable[["RunDialog", Settings, _SettingSpec], Any]]] = {
+        _SettingType.STRING: _restore_string,
+        _SettingType.NUMBER: _restore_number,
+        _SettingType.ARRAY: _restore_array,
+        _SettingType.BOOLEAN: _restore_bool,
+    }
+    _READ: Final[Dict[_SettingType, Callable[["RunDialog", _SettingSpec], Any]]] = {
+        _SettingType.STRING: _read_string,
+        _SettingType.NUMBER: _read_number,
+        _SettingType.ARRAY: _read_array,
+        _SettingType.BOOLEAN: _read_bool,
+    }
+    _WRITE: Final[Dict[_SettingType, Callable[..., Any]]] = {
+        _SettingType.STRING: Settings.set_string,
+        # set_integer can only be used for positive integers, so using set_double as a workaround
+        _SettingType.NUMBER: Settings.set_double,
+        _SettingType.ARRAY: Settings.set_string_list,
+        _SettingType.BOOLEAN: Settings.set_bool,
+    }
+
+    @Slot()
+    def accept(self):
+        """Flush pending edits and only close the dialog if they are valid"""
+        if self.apply():
+            super().accept()
+
+    @Slot()
+    def reject(self):
+        """
+        Flush pending edits before closing since edits are saved as soon as they are made.
+        Invalid pending edits are silently discarded, cancelling never shows a validation error.
+        """
+        self.apply(show_errors=False)
+        super().reject()
+
+    @Slot()
+    def apply(self, show_errors: bool = True) -> bool:
+        """Validate changed inputs and save them to settings, returns whether it succeeded"""
+
+        self._apply_timer.stop()
 
-                elif prop["type"] == "array":
-                    settings.set_string_list(
-                        f"{self.prefix}{name}",
-                        self.entries[name].get_results(),
-                        view=self.bv,
-                        scope=SettingsScope.SettingsResourceScope,
-                    )
-                elif prop["type"] == "boolean":
-                    settings.set_bool(
+        settings = Settings()
+        errors: List[str] = []
+        for spec in self.schema:
+            name = spec.name
+            if name not in self._dirty:
+                continue
+
+            # keep saving the other settings if one of them is invalid
+            try:
+                value = RunDialog._READ[spec.type](self, spec)
+                if self._last_written.get(name) != value:
+                    RunDialog._WRITE[spec.type](
+                        settings,
                         f"{self.prefix}{name}",
-                        self.entries[name].isChecked(),
+                        value,
                         view=self.bv,
                         scope=SettingsScope.SettingsResourceScope,
                     )
-
-            self.acceptButton.setEnabled(True)
-        except Exception as e:
-            show_message_box("Invalid Run Options", str(e))
+                    self._last_written[name] = value
+                self._dirty.discard(name)
+            except Exception as e:
+                errors.append(f"{spec.prop['title']}: {e}")
+
+        if errors:
+            if show_errors:
+                show_message_box("Invalid Run Options", "\n".join(errors))
             self.acceptButton.setEnabled(False)
+            return False
+
+        self.acceptButton.setEnabled(True)
+        return True
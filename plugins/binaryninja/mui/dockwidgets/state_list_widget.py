@@ -1,3 +1,4 @@
+from itertools import chain
 from typing import Dict, Final, Optional
 
 from binaryninjaui import DockContextHandler, ViewFrame
@@ -17,7 +18,7 @@ from PySide6.QtWidgets import (
 from binaryninja import BinaryView
 from mui.dockwidgets import widget
 from mui.dockwidgets.state_graph_widget import StateGraphWidget
-from mui.utils import MUIState
+from mui.utils import MUIState, MUIStateDelta
 
 
 class StateListWidget(QWidget, DockContextHandler):
@@ -38,6 +39,9 @@ class StateListWidget(QWidget, DockContextHandler):
     CTX_MENU_UNTRACE: Final[str] = "Hide Trace"
     CTX_MENU_SAVE_TRACE: Final[str] = "Save Trace"
 
+    # Tree header title (without state count)
+    TREE_TITLE: Final[str] = "State List"
+
     def __init__(self, name: str, parent: ViewFrame, data: BinaryView):
         QWidget.__init__(self, parent)
         DockContextHandler.__init__(self, self, name)
@@ -47,7 +51,7 @@ class StateListWidget(QWidget, DockContextHandler):
 
         tree_widget = QTreeWidget()
         tree_widget.setColumnCount(1)
-        tree_widget.headerItem().setText(0, "State List")
+        tree_widget.headerItem().setText(0, StateListWidget.TREE_TITLE)
         self.tree_widget = tree_widget
         tree_widget.itemDoubleClicked.connect(self.on_click)
         tree_widget.installEventFilter(self)
@@ -67,6 +71,16 @@ class StateListWidget(QWidget, DockContextHandler):
             self.complete_states,
             self.error_states,
         ]
+        # state lists that are fully determined by the state status
+        self._status_to_list: Dict[StateStatus, QTreeWidgetItem] = {
+            StateStatus.running: self.active_states,
+            StateStatus.waiting_for_worker: self.waiting_states,
+            StateStatus.waiting_for_solver: self.waiting_states,
+            StateStatus.destroyed: self.forked_states,
+        }
+
+        # titles without state counts, in the same order as state_lists
+        self._base_titles = [state_list.text(0) for state_list in self.state_lists]
         tree_widget.insertTopLevelItems(0, self.state_lists)
         for state_list in self.state_lists:
             tree_widget.expandItem(state_list)
@@ -161,42 +175,52 @@ class StateListWidget(QWidget, DockContextHandler):
         """Register this widget with a MUI State object and set up event listeners"""
         if self.mui_state:
             self.mui_state.clear_highlight_trace()
-            self.on_state_change(self.mui_state.states, mui_state.states)
+            self.on_state_change(MUIStateDelta.between(self.mui_state.states, mui_state.states))
 
         self.mui_state = mui_state
         mui_state.on_state_change(self.on_state_change)
 
-    def on_state_change(
-        self, old_states: Dict[int, StateDescriptor], new_states: Dict[int, StateDescriptor]
-    ):
-        """Updates the UI to reflect new_states, clears everything if an empty dict is provided"""
-        # add/update new states
-        for state_id, state in new_states.items():
-            if state_id in self.state_items:
-                item = self.state_items[state_id]
-                self._update_item(item, state)
-            else:
-                item = self._create_item(state)
-                self.state_items[state_id] = item
+    def on_state_change(self, delta: MUIStateDelta):
+        """Updates the UI to reflect a state delta, clears everything if there are no new states"""
+        tree_widget = self.tree_widget
+
+        # suspend repaints and signals so that bulk updates only trigger a single repaint
+        tree_widget.setUpdatesEnabled(False)
+        tree_widget.blockSignals(True)
+        try:
+            state_items = self.state_items
+            new_states = delta.new_states
+
+            # deltas may be computed concurrently from the same old states (daemon and runner
+            # threads), so tolerate ids that were already added or removed
+
+            # add/update new states
+            for state_id in chain(delta.added, delta.updated):
+                item = state_items.get(state_id)
+                if item is not None:
+                    self._update_item(item, new_states[state_id])
+                else:
+                    state_items[state_id] = self._create_item(new_states[state_id])
 
-        # remove old states
-        for removed_state_id in set(old_states.keys()) - set(new_states.keys()):
-            item = self.state_items[removed_state_id]
-            item.parent().removeChild(item)
-            del self.state_items[removed_state_id]
+            # remove old states
+            for removed_state_id in delta.removed:
+                item = state_items.pop(removed_state_id, None)
+                if item is not None:
+                    item.parent().removeChild(item)
 
-        # update list counts
-        self._refresh_list_counts()
+            # update list counts
+            self._refresh_list_counts()
+        finally:
+            tree_widget.blockSignals(False)
+            tree_widget.setUpdatesEnabled(True)
+            tree_widget.viewport().update()
 
     def _get_state_list(self, state: StateDescriptor) -> QTreeWidgetItem:
         """Get the corresponding state list for a given state"""
 
-        if state.status == StateStatus.running:
-            return self.active_states
-        elif state.status in [StateStatus.waiting_for_worker, StateStatus.waiting_for_solver]:
-            return self.waiting_states
-        elif state.status == StateStatus.destroyed:
-            return self.forked_states
+        state_list = self._status_to_list.get(state.status)
+        if state_list is not None:
+            return state_list
         elif state.status == StateStatus.stopped:
             # Only want killed states in the errored list
             if self.mui_state and state.state_id in self.mui_state.paused_states:
@@ -231,20 +255,13 @@ class StateListWidget(QWidget, DockContextHandler):
         total_count = 0
 
         # update count for each individual list
-        for state_list in self.state_lists:
+        for state_list, title in zip(self.state_lists, self._base_titles):
             child_count = state_list.childCount()
-            state_list.setText(0, f'{state_list.text(0).split(" ")[0]} ({child_count})')
+            state_list.setText(0, f"{title} ({child_count})")
 
             total_count += child_count
 
-        header_item = self.tree_widget.headerItem()
-
-        title_without_count = header_item.text(0)
-        # strip previous count from title
-        if title_without_count[-1] == ")":
-            title_without_count = title_without_count[: title_without_count.rfind("(") - 1]
-
-        header_item.setText(0, f"{title_without_count} ({total_count})")
+        self.tree_widget.headerItem().setText(0, f"{StateListWidget.TREE_TITLE} ({total_count})")
 
     def _save_trace(self, state_id):
         """Context menu function to save trace data to file"""
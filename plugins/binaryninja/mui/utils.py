@@ -1,12 +1,14 @@
+import bisect
 import importlib.resources
 import json
-import os
 import typing
 from ctypes import Structure, c_uint16, c_uint32
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from inspect import getmembers, isfunction
 from pathlib import Path
+from shutil import which
 
 from manticore.core.plugin import StateDescriptor
 from manticore.core.state import StateBase, TerminateState
@@ -22,17 +24,35 @@ from binaryninja import (
 )
 
 
+@dataclass
+class MUIStateDelta:
+    """Changes between two consecutive snapshots of manticore states"""
+
+    new_states: typing.Dict[int, StateDescriptor]
+    added: typing.Set[int]
+    updated: typing.Set[int]
+    removed: typing.Set[int]
+
+    @staticmethod
+    def between(
+        old_states: typing.Dict[int, StateDescriptor], new_states: typing.Dict[int, StateDescriptor]
+    ) -> "MUIStateDelta":
+        """Computes the delta going from old_states to new_states"""
+        return MUIStateDelta(
+            new_states,
+            new_states.keys() - old_states.keys(),
+            new_states.keys() & old_states.keys(),
+            old_states.keys() - new_states.keys(),
+        )
+
+
 class MUIState:
     def __init__(self, bv: BinaryView, m: Manticore, filename: str):
         self.bv = bv
         self.m = m
         self.filename = filename
         self.states: typing.Dict[int, StateDescriptor] = {}
-        self.state_change_listeners: typing.List[
-            typing.Callable[
-                [typing.Dict[int, StateDescriptor], typing.Dict[int, StateDescriptor]], None
-            ]
-        ] = []
+        self.state_change_listeners: typing.List[typing.Callable[[MUIStateDelta], None]] = []
         self.paused_states: typing.Set[int] = set()
         self.state_callbacks: typing.Dict[int, typing.Set[typing.Callable]] = dict()
         self.state_trace: typing.Dict[int, typing.Set[int]] = dict()
@@ -80,19 +100,18 @@ class MUIState:
 
     def on_state_change(
         self,
-        callback: typing.Callable[
-            [typing.Dict[int, StateDescriptor], typing.Dict[int, StateDescriptor]], None
-        ],
+        callback: typing.Callable[[MUIStateDelta], None],
     ) -> None:
         """Register an event listener for state changes"""
         self.state_change_listeners.append(callback)
 
     def notify_states_changed(self, new_states: typing.Dict[int, StateDescriptor]) -> None:
         """Updates internal states and invokes listeners"""
-        old_states = self.states
+        # computed once here instead of in every listener
+        delta = MUIStateDelta.between(self.states, new_states)
 
         for callback in self.state_change_listeners:
-            callback(old_states, new_states)
+            callback(delta)
 
         self.states = new_states
 
@@ -218,53 +237,49 @@ class MUIState:
         drcov.write_to_file(filename)
 
 
+# highlight used to clear block highlights, shared across calls
+_NO_HIGHLIGHT = HighlightColor(HighlightStandardColor.NoHighlightColor)
+
+
 def highlight_instr(bv: BinaryView, addr: int, color: HighlightStandardColor) -> None:
     """Highlight instruction at a given address"""
-    blocks = bv.get_basic_blocks_at(addr)
-    for block in blocks:
-        block.set_auto_highlight(HighlightColor(color, alpha=128))
+    block_color = HighlightColor(color, alpha=128)
+    for block in bv.get_basic_blocks_at(addr):
+        block.set_auto_highlight(block_color)
         block.function.set_auto_instr_highlight(addr, color)
 
 
 def highlight_block(bv: BinaryView, addr: int, color: HighlightStandardColor) -> None:
     """Highlight all instructions in block containing a given address"""
-    blocks = bv.get_basic_blocks_at(addr)
-    for block in blocks:
-        block.set_auto_highlight(HighlightColor(color, alpha=128))
+    block_color = HighlightColor(color, alpha=128)
+    for block in bv.get_basic_blocks_at(addr):
+        block.set_auto_highlight(block_color)
         for line in block.disassembly_text:
             block.function.set_auto_instr_highlight(line.address, color)
 
 
 def clear_highlight(bv: BinaryView, addr: int) -> None:
     """Remove instruction highlight"""
-    blocks = bv.get_basic_blocks_at(addr)
-    for block in blocks:
-        block.set_auto_highlight(HighlightColor(HighlightStandardColor.NoHighlightColor))
+    for block in bv.get_basic_blocks_at(addr):
+        block.set_auto_highlight(_NO_HIGHLIGHT)
         block.function.set_auto_instr_highlight(addr, HighlightStandardColor.NoHighlightColor)
 
 
 def clear_highlight_block(bv: BinaryView, addr: int) -> None:
     """Removes highlight from all instructions in block containing a given address"""
-    blocks = bv.get_basic_blocks_at(addr)
-    for block in blocks:
-        block.set_auto_highlight(HighlightColor(HighlightStandardColor.NoHighlightColor))
+    for block in bv.get_basic_blocks_at(addr):
+        block.set_auto_highlight(_NO_HIGHLIGHT)
         for line in block.disassembly_text:
             block.function.set_auto_instr_highlight(
                 line.address, HighlightStandardColor.NoHighlightColor
             )
 
 
-def get_default_solc_path():
+@lru_cache(maxsize=1)
+def get_default_solc_path() -> str:
     """Attempt to find the path for the solc binary"""
 
-    possible_paths = [Path(x) for x in os.environ["PATH"].split(":")]
-    possible_paths.extend([Path(os.path.expanduser("~"), ".local/bin").resolve()])
-
-    for path in possible_paths:
-        if Path(path, "solc").is_file():
-            return str(Path(path, "solc"))
-
-    return ""
+    return which("solc") or which("solc", path=str(Path.home() / ".local/bin")) or ""
 
 
 def read_from_common(resource: str) -> typing.Dict[str, typing.Any]:
@@ -299,11 +314,21 @@ def print_timestamp(*args, **kw):
 
 @dataclass
 class MUIFunctionModel:
+    # dataclass(slots=True) requires Python 3.10
+    __slots__ = ("name", "func")
+
     name: str
     func: typing.Callable
 
 
-def get_function_models() -> typing.List[MUIFunctionModel]:
+# non-function model functions found in manticore.native.models
+_MODEL_BLACKLIST: typing.FrozenSet[str] = frozenset(
+    ["isvariadic", "variadic", "must_be_NULL", "cannot_be_NULL", "can_be_NULL"]
+)
+
+
+@lru_cache(maxsize=1)
+def get_function_models() -> typing.Tuple[MUIFunctionModel, ...]:
     """
     Returns available function models
     ref: https://github.com/trailofbits/manticore/blob/master/docs/native.rst#function-models
@@ -315,19 +340,16 @@ def get_function_models() -> typing.List[MUIFunctionModel]:
 
     # Manually remove non-function model functions
     def is_model(model: MUIFunctionModel) -> bool:
-        blacklist = set(["isvariadic", "variadic", "must_be_NULL", "cannot_be_NULL", "can_be_NULL"])
         if model.func.__module__ != "manticore.native.models":
             return False
         # Functions starting with '_' assumed to be private
         if model.name.startswith("_"):
             return False
-        if model.name in blacklist:
+        if model.name in _MODEL_BLACKLIST:
             return False
         return True
 
-    func_models = list(filter(is_model, func_models))
-
-    return func_models
+    return tuple(filter(is_model, func_models))
 
 
 def function_model_analysis_cb(bv: BinaryView) -> None:
@@ -336,26 +358,29 @@ def function_model_analysis_cb(bv: BinaryView) -> None:
     Tries to match functions with same name as available function models
     """
     models = get_function_models()
-    model_names = [model.name for model in models]
+    model_names = sorted(model.name for model in models)
     matches = set()
     for func in bv.functions:
-        for name in model_names:
-            if name.startswith(func.name):
-                matches.add(func)
+        # names starting with func.name are contiguous in the sorted list and the first
+        # candidate is the smallest name >= func.name
+        idx = bisect.bisect_left(model_names, func.name)
+        if idx < len(model_names) and model_names[idx].startswith(func.name):
+            matches.add(func)
 
     if matches:
-        banner = "\n"
-        banner += "###################################\n"
-        banner += "# MUI Function Model Analysis     #\n"
-        banner += "#                                 #\n"
-        banner += f"# {len(matches):02d} function(s) match:           #\n"
-        for func in matches:
-            s = f"# * {func.start:08x}, {func.name}"
-            banner += s.ljust(34, " ") + "#\n"
-        banner += "###################################\n"
-        banner += "-> Use 'Add Function Model' to hook these functions"
-
-        print(banner)
+        lines = [
+            "",
+            "###################################",
+            "# MUI Function Model Analysis     #",
+            "#                                 #",
+            f"# {len(matches):02d} function(s) match:           #",
+        ]
+        for func in sorted(matches, key=lambda f: f.start):
+            lines.append(f"# * {func.start:08x}, {func.name}".ljust(34, " ") + "#")
+        lines.append("###################################")
+        lines.append("-> Use 'Add Function Model' to hook these functions")
+
+        print("\n".join(lines))
 
 
 # Adapted from https://www.ayrx.me/drcov-file-format
@@ -0,0 +1,42 @@
+import unittest
+from unittest.mock import MagicMock
+
+from mui.dockwidgets.state_list_widget import StateListWidget
+from mui.utils import MUIStateDelta
+
+
+class StateListWidgetTest(unittest.TestCase):
+    def setUp(self):
+        # only the attributes used by on_state_change are needed, so avoid creating Qt widgets
+        self.widget = MagicMock()
+        self.widget.state_items = {}
+        self.widget._create_item.side_effect = lambda state: MagicMock()
+
+    def test_repeated_delta(self) -> None:
+        old_item = MagicMock()
+        self.widget.state_items = {0: old_item}
+
+        # the same delta applied twice, e.g. computed by two threads from the same old states
+        delta = MUIStateDelta.between({0: MagicMock()}, {1: MagicMock()})
+        StateListWidget.on_state_change(self.widget, delta)
+        StateListWidget.on_state_change(self.widget, delta)
+
+        self.assertEqual(list(self.widget.state_items.keys()), [1])
+        self.widget._create_item.assert_called_once_with(delta.new_states[1])
+        self.widget._update_item.assert_called_once_with(
+            self.widget.state_items[1], delta.new_states[1]
+        )
+        old_item.parent().removeChild.assert_called_once_with(old_item)
+
+    def test_update_unknown_state(self) -> None:
+        state = MagicMock()
+        delta = MUIStateDelta.between({2: MagicMock()}, {2: state})
+        StateListWidget.on_state_change(self.widget, delta)
+
+        self.assertIn(2, self.widget.state_items)
+        self.widget._create_item.assert_called_once_with(state)
+        self.widget._update_item.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from typing import List
+from unittest.mock import MagicMock, patch
+
+from mui.utils import (
+    MUIFunctionModel,
+    MUIState,
+    MUIStateDelta,
+    function_model_analysis_cb,
+)
+
+
+class MUIStateDeltaTest(unittest.TestCase):
+    def test_between(self) -> None:
+        old_states = {0: MagicMock(), 1: MagicMock(), 2: MagicMock()}
+        new_states = {1: MagicMock(), 2: MagicMock(), 3: MagicMock()}
+
+        delta = MUIStateDelta.between(old_states, new_states)
+
+        self.assertIs(delta.new_states, new_states)
+        self.assertEqual(delta.added, {3})
+        self.assertEqual(delta.updated, {1, 2})
+        self.assertEqual(delta.removed, {0})
+
+    def test_notify_states_changed(self) -> None:
+        mui_state = MUIState(MagicMock(), MagicMock(), "")
+        deltas: List[MUIStateDelta] = []
+        mui_state.on_state_change(deltas.append)
+
+        first_states = {0: MagicMock()}
+        second_states = {1: MagicMock()}
+        mui_state.notify_states_changed(first_states)
+        mui_state.notify_states_changed(second_states)
+
+        self.assertEqual(len(deltas), 2)
+        self.assertEqual(
+            (deltas[0].added, deltas[0].updated, deltas[0].removed), ({0}, set(), set())
+        )
+        self.assertEqual((deltas[1].added, deltas[1].updated, deltas[1].removed), ({1}, set(), {0}))
+        self.assertIs(mui_state.states, second_states)
+
+
+class FunctionModelAnalysisTest(unittest.TestCase):
+    MODELS = tuple(MUIFunctionModel(name, lambda: None) for name in ["strlen", "strcmp", "malloc"])
+
+    @staticmethod
+    def make_function(name: str, start: int) -> MagicMock:
+        func = MagicMock()
+        func.name = name
+        func.start = start
+        return func
+
+    def run_analysis(self, functions: List[MagicMock]) -> str:
+        bv = MagicMock()
+        bv.functions = functions
+        output = io.StringIO()
+        with patch("mui.utils.get_function_models", return_value=self.MODELS):
+            with redirect_stdout(output):
+                function_model_analysis_cb(bv)
+        return output.getvalue()
+
+    def test_matches(self) -> None:
+        output = self.run_analysis(
+            [
+                self.make_function("strcpy_custom", 0x3000),
+                self.make_function("malloc", 0x2000),
+                self.make_function("str", 0x1000),
+                self.make_function("foo", 0x4000),
+            ]
+        )
+
+        self.assertIn("# 02 function(s) match:", output)
+        # exact name and prefix of a model name match, non-matches are not listed
+        self.assertIn("00002000, malloc", output)
+        self.assertIn("00001000, str", output)
+        self.assertNotIn("strcpy_custom", output)
+        self.assertNotIn("foo", output)
+        # matches are listed by address
+        self.assertLess(output.index("00001000, str"), output.index("00002000, malloc"))
+
+    def test_no_matches(self) -> None:
+        output = self.run_analysis([self.make_function("foo", 0x1000)])
+
+        self.assertEqual(output, "")
+
+
+if __name__ == "__main__":
+    unittest.main()